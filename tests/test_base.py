@@ -53,12 +53,11 @@ def test_updatez_get():
     assert res.status_code == 405, res.text
 
 
-def test_updatez_no_token_configured():
+def test_updatez_no_token_configured(monkeypatch):
     before = settings.UPDATE_TOKEN
-    settings.UPDATE_TOKEN = ""
+    monkeypatch.setattr(settings, "UPDATE_TOKEN", "")
     res = client.post(f"/updatez?token={before}")
     assert res.status_code == 403, res.text
-    settings.UPDATE_TOKEN = before
 
 
 def test_updatez_no_token():
@@ -0,0 +1,63 @@
+import asyncio
+import pytest
+
+from yente import cache
+from yente.cache import single_flight
+
+
+@pytest.mark.asyncio
+async def test_single_flight_shared():
+    calls = []
+
+    async def work():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return {"hits": 3}
+
+    results = await asyncio.gather(*[single_flight("shared", work) for _ in range(5)])
+    assert len(calls) == 1
+    assert all(r is results[0] for r in results)
+    assert "shared" not in cache._inflight
+
+    # Once it is done, the next caller runs the operation again:
+    await single_flight("shared", work)
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_single_flight_exception():
+    calls = []
+
+    async def fail():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        raise ValueError("index down")
+
+    flights = [single_flight("failing", fail) for _ in range(3)]
+    results = await asyncio.gather(*flights, return_exceptions=True)
+    assert len(calls) == 1
+    assert all(isinstance(r, ValueError) for r in results), results
+    assert "failing" not in cache._inflight
+
+    with pytest.raises(ValueError):
+        await single_flight("failing", fail)
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_single_flight_cancel_waiter():
+    calls = []
+
+    async def work():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "done"
+
+    first = asyncio.ensure_future(single_flight("cancel", work))
+    second = asyncio.ensure_future(single_flight("cancel", work))
+    await asyncio.sleep(0.01)
+    first.cancel()
+    assert await second == "done"
+    assert first.cancelled()
+    assert len(calls) == 1
+    assert "cancel" not in cache._inflight
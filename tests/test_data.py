@@ -2,7 +2,7 @@ import pytest
 from pathlib import Path
 
 from yente.data import get_catalog
-from yente.data.loader import load_json_lines
+from yente.data.loader import load_json_lines, parse_json_lines
 from yente.data.util import get_url_local_path
 from yente.data.util import phonetic_names
 
@@ -13,6 +13,33 @@ async def test_manifest():
     assert len(catalog.datasets), catalog.datasets
 
 
+async def _parse_chunks(chunks):
+    async def iter_chunks():
+        for chunk in chunks:
+            yield chunk
+
+    return [data async for data in parse_json_lines(iter_chunks())]
+
+
+@pytest.mark.asyncio
+async def test_parse_json_lines():
+    data = b'{"id": "a"}\n{"id": "b", "name": "\xc3\xbc"}\n\n{"id": "c"}\n'
+    expected = [{"id": "a"}, {"id": "b", "name": "\u00fc"}, {"id": "c"}]
+    assert await _parse_chunks([data]) == expected
+    # Lines and multi-byte characters split across chunks:
+    for size in (1, 2, 5, 13):
+        chunks = [data[i : i + size] for i in range(0, len(data), size)]
+        assert await _parse_chunks(chunks) == expected, size
+    # Windows line endings and no newline at the end of the stream:
+    data = b'{"id": "a"}\r\n{"id": "b"}\r\n{"id": "c"}'
+    expected = [{"id": "a"}, {"id": "b"}, {"id": "c"}]
+    assert await _parse_chunks([data]) == expected
+    chunks = [data[i : i + 3] for i in range(0, len(data), 3)]
+    assert await _parse_chunks(chunks) == expected
+    assert await _parse_chunks([]) == []
+    assert await _parse_chunks([b"\n", b"  \r\n"]) == []
+
+
 @pytest.mark.asyncio
 async def test_local_dataset():
     catalog = await get_catalog()
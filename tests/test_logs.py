@@ -0,0 +1,37 @@
+import logging
+import structlog
+
+from yente.logs import add_timestamp, configure_logging, get_logger, stop_logging
+
+
+def test_exception_traceback_logged(capsys):
+    config = structlog.get_config()
+    root_logger = logging.getLogger()
+    handlers = list(root_logger.handlers)
+    level = root_logger.level
+    try:
+        configure_logging()
+        log = get_logger("yente.test")
+        try:
+            1 / 0
+        except ZeroDivisionError:
+            log.exception("Failed to divide")
+        # Writes out the lines queued for the listener thread:
+        stop_logging()
+        err = capsys.readouterr().err
+        assert "Failed to divide" in err
+        assert "Traceback" in err
+        assert "ZeroDivisionError" in err
+    finally:
+        stop_logging()
+        root_logger.handlers = handlers
+        root_logger.setLevel(level)
+        structlog.configure(**config)
+
+
+def test_timestamp_from_record():
+    # Lines from other libraries are stamped with the time they were logged, not
+    # when the listener thread renders them:
+    record = logging.makeLogRecord({"msg": "hello", "created": 0.5})
+    ed = add_timestamp(None, "info", {"event": "hello", "_record": record})
+    assert ed["timestamp"] == "1970-01-01T00:00:00.500000Z"
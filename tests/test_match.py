@@ -1,5 +1,18 @@
+import os
+import signal
+import asyncio
+import pytest
+from concurrent.futures.process import BrokenProcessPool
+
 from .conftest import client
 
+from yente import settings
+from yente.cache import results_cache
+from yente.data.common import EntityExample
+from yente.data.entity import Entity
+from yente.routers.util import get_algorithm_by_name
+from yente.scoring import close_score_pool, get_score_pool, score_results_pooled
+
 EXAMPLE = {
     "schema": "Person",
     "properties": {
@@ -159,3 +172,82 @@ def test_id_pass_through():
     res = resp.json()["responses"]["no1"]
     assert res["query"]["schema"] == "Person"
     assert res["query"]["id"] == "ermakov"
+
+
+def test_match_score_workers(monkeypatch):
+    query = {"queries": {"vv": EXAMPLE, "ermakov": ERMAKOV}}
+    resp = client.post("/match/default", json=query)
+    assert resp.status_code == 200, resp.text
+    inline = resp.json()["responses"]
+
+    monkeypatch.setattr(settings, "SCORE_WORKERS", 2)
+    results_cache.clear()
+    try:
+        resp = client.post("/match/default", json=query)
+    finally:
+        close_score_pool()
+    assert resp.status_code == 200, resp.text
+    pooled = resp.json()["responses"]
+    # Lists built from sets (e.g. referents) can be ordered differently in the
+    # worker processes, so only the ranking is compared:
+    for name, res in inline.items():
+        expected = [(r["id"], r["score"]) for r in res["results"]]
+        actual = [(r["id"], r["score"]) for r in pooled[name]["results"]]
+        assert expected == actual, name
+
+
+def test_score_pool_recovers(monkeypatch):
+    monkeypatch.setattr(settings, "SCORE_WORKERS", 1)
+    algorithm = get_algorithm_by_name(settings.DEFAULT_ALGORITHM)
+    example = EntityExample.model_validate({"id": "putin", **EXAMPLE})
+    entity = Entity.from_example(example)
+    try:
+        pool = get_score_pool()
+        pid = pool.submit(os.getpid).result()
+        os.kill(pid, signal.SIGKILL)
+        with pytest.raises(BrokenProcessPool):
+            asyncio.run(score_results_pooled(algorithm, entity, [entity]))
+        total, _ = asyncio.run(score_results_pooled(algorithm, entity, [entity]))
+        assert total == 1
+        assert get_score_pool() is not pool
+    finally:
+        close_score_pool()
+
+
+def test_match_results_cache():
+    results_cache.clear()
+    query = {"queries": {"vv": EXAMPLE, "xx": EXAMPLE, "ermakov": ERMAKOV}}
+    resp = client.post("/match/default", json=query)
+    assert resp.status_code == 200, resp.text
+    assert resp.headers["x-batch-size"] == "3"
+    first = resp.json()["responses"]
+    assert first["vv"] == first["xx"]
+
+    resp = client.post("/match/default", json=query)
+    assert resp.status_code == 200, resp.text
+    assert resp.headers["x-batch-size"] == "3"
+    assert resp.json()["responses"] == first
+
+    resp = client.post("/match/default", json=query, params={"limit": 1})
+    assert resp.status_code == 200, resp.text
+    assert len(resp.json()["responses"]["ermakov"]["results"]) <= 1
+
+    # Examples are cached individually, so they are found again in other batches:
+    resp = client.post("/match/default", json={"queries": {"other": ERMAKOV}})
+    assert resp.status_code == 200, resp.text
+    assert resp.json()["responses"]["other"] == first["ermakov"]
+
+
+def test_match_large_integer_value():
+    example = {
+        "schema": "Company",
+        "properties": {
+            "name": ["Brilliant Amazing Limited"],
+            "registrationNumber": [123456789012345678901234567890],
+        },
+    }
+    resp = client.post("/match/default", json={"queries": {"no1": example}})
+    assert resp.status_code == 200, resp.text
+    res = resp.json()["responses"]["no1"]
+    regno = res["query"]["properties"]["registrationNumber"]
+    assert regno == ["123456789012345678901234567890"]
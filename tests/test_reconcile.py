@@ -3,6 +3,9 @@ from normality import ascii_text
 
 from .conftest import client
 
+from yente.cache import results_cache
+from yente.routers import reconcile as reconcile_router
+
 
 def test_reconcile_metadata():
     resp = client.get("/reconcile/default")
@@ -15,6 +18,30 @@ def test_reconcile_metadata():
     assert "extend" in data, data
 
 
+def test_reconcile_metadata_etag():
+    resp = client.get("/reconcile/default")
+    assert resp.status_code == 200, resp.text
+    etag = resp.headers["etag"]
+    resp = client.get("/reconcile/default", headers={"If-None-Match": etag})
+    assert resp.status_code == 304, resp.text
+    assert resp.headers["etag"] == etag
+
+
+def test_reconcile_metadata_etag_reindex(monkeypatch):
+    resp = client.get("/reconcile/default")
+    assert resp.status_code == 200, resp.text
+    etag = resp.headers["etag"]
+
+    # Once other indices are served, the old ETag must not produce a 304:
+    async def get_index_state(provider):
+        return "reindexed"
+
+    monkeypatch.setattr(reconcile_router, "get_index_state", get_index_state)
+    resp = client.get("/reconcile/default", headers={"If-None-Match": etag})
+    assert resp.status_code == 200, resp.text
+    assert resp.headers["etag"] != etag
+
+
 def test_reconcile_post_query():
     queries = {"mutti": {"query": "Yevgeny Popov"}}
     resp = client.post("/reconcile/default", data={"queries": json.dumps(queries)})
@@ -44,6 +71,26 @@ def test_reconcile_invalid():
     assert resp.status_code == 400, resp.text
 
 
+def test_reconcile_large_integer_value(monkeypatch):
+    searches = []
+    original = reconcile_router.msearch_entities
+
+    async def msearch_entities(provider, queries, limit):
+        searches.extend(queries)
+        return await original(provider, queries, limit=limit)
+
+    results_cache.clear()
+    monkeypatch.setattr(reconcile_router, "msearch_entities", msearch_entities)
+    prop = {"pid": "Company:registrationNumber", "v": 123456789012345678901234567890}
+    queries = {"q0": {"query": "Brilliant", "type": "Company", "properties": [prop]}}
+    resp = client.post("/reconcile/default", data={"queries": json.dumps(queries)})
+    assert resp.status_code == 200, resp.text
+    assert "result" in resp.json()["q0"]
+    # The value must reach the index query as written, not rounded to a float:
+    assert len(searches) == 1, searches
+    assert "123456789012345678901234567890" in json.dumps(searches)
+
+
 def test_reconcile_suggest_entity_no_prefix():
     resp = client.get("/reconcile/default/suggest/entity")
     assert resp.status_code == 200, resp.text
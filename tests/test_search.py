@@ -2,6 +2,9 @@ from datetime import datetime, timedelta
 
 from .conftest import client
 
+from yente.cache import results_cache
+from yente.routers import search as search_router
+
 
 def test_search_putin():
     res = client.get("/search/default?q=vladimir putin")
@@ -268,3 +271,34 @@ def test_search_range_limit():
     data = res.json()
     assert data["limit"] < 10000, data
     assert data["offset"] == 0, data
+
+
+def test_search_results_cache():
+    results_cache.clear()
+    res = client.get("/search/default?q=vladimir putin&limit=3")
+    assert res.status_code == 200, res
+    first = res.json()
+    assert len(results_cache.entries) == 1
+    res = client.get("/search/default?q=vladimir putin&limit=3")
+    assert res.json() == first
+    assert len(results_cache.entries) == 1
+    res = client.get("/search/default?q=vladimir putin&limit=2")
+    assert len(res.json()["results"]) <= 2
+    assert len(results_cache.entries) == 2
+
+
+def test_search_results_cache_reindex(monkeypatch):
+    results_cache.clear()
+    res = client.get("/search/default?q=vladimir putin&limit=3")
+    assert res.status_code == 200, res
+    assert len(results_cache.entries) == 1
+
+    # Results from a previous index are not used once a new one is served, even
+    # if the reindex ran in another process:
+    async def get_index_state(provider):
+        return "reindexed"
+
+    monkeypatch.setattr(search_router, "get_index_state", get_index_state)
+    res = client.get("/search/default?q=vladimir putin&limit=3")
+    assert res.status_code == 200, res
+    assert len(results_cache.entries) == 2
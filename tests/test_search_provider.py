@@ -1,9 +1,11 @@
 # mypy: ignore-errors
+import asyncio
 import pytest
 from yente import settings
 
+import yente.provider as provider_module
 from yente.exc import YenteIndexError, YenteNotFoundError
-from yente.provider import SearchProvider
+from yente.provider import SearchProvider, close_provider, get_provider
 
 
 @pytest.mark.asyncio
@@ -78,3 +80,50 @@ async def test_alias_management(search_provider: SearchProvider):
     await search_provider.delete_index(index_v2)
     assert not await search_provider.exists_index_alias(alias, index_v2)
     assert await search_provider.get_alias_indices(alias) == []
+
+
+@pytest.mark.asyncio
+async def test_msearch(search_provider: SearchProvider):
+    queries = [
+        {"term": {"schema": "Person"}},
+        {"match_all": {}},
+        {"term": {"schema": "NoSuchSchema"}},
+    ]
+    responses = await search_provider.msearch(settings.ENTITY_INDEX, queries, size=3)
+    assert len(responses) == 3
+    for hit in responses[0]["hits"]["hits"]:
+        assert hit["_source"]["schema"] == "Person"
+    assert len(responses[1]["hits"]["hits"]) == 3
+    assert len(responses[2]["hits"]["hits"]) == 0
+
+    # Without a size, the index default of 10 results applies:
+    responses = await search_provider.msearch(settings.ENTITY_INDEX, queries)
+    assert len(responses) == 3
+    assert len(responses[1]["hits"]["hits"]) == 10
+
+    with pytest.raises(YenteIndexError):
+        fake_index = settings.ENTITY_INDEX + "-doesnt-exist"
+        await search_provider.msearch(fake_index, queries)
+
+
+@pytest.mark.asyncio
+async def test_get_provider_concurrent(monkeypatch):
+    created = []
+
+    class FakeProvider:
+        async def close(self):
+            pass
+
+    async def create_provider():
+        await asyncio.sleep(0.05)
+        created.append(FakeProvider())
+        return created[-1]
+
+    await close_provider()
+    monkeypatch.setattr(provider_module, "_create_provider", create_provider)
+    try:
+        providers = await asyncio.gather(*[get_provider() for _ in range(5)])
+        assert len(created) == 1
+        assert all(p is created[0] for p in providers)
+    finally:
+        await close_provider()
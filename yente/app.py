@@ -1,4 +1,5 @@
 import time
+import asyncio
 import aiocron  # type: ignore
 from typing import AsyncGenerator, Dict, Type, Callable, Any, Coroutine, Union
 from contextlib import asynccontextmanager
@@ -8,7 +9,7 @@ from fastapi import Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
 from starlette.middleware.base import RequestResponseEndpoint
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from structlog.contextvars import clear_contextvars, bind_contextvars
 
 from yente import settings
@@ -17,7 +18,8 @@ from yente.logs import get_logger
 from yente.routers import reconcile, search, match, admin
 from yente.data import refresh_catalog
 from yente.search.indexer import update_index_threaded
-from yente.provider import close_provider
+from yente.provider import close_provider, get_provider
+from yente.scoring import close_score_pool, preload_algorithms, start_score_pool
 from yente.middleware import TraceContextMiddleware
 
 log = get_logger("yente")
@@ -30,6 +32,18 @@ async def cron_task() -> None:
         update_index_threaded()
 
 
+async def warm_up_index() -> None:
+    """Connect to the search index and run a small query before the first requests
+    come in, so that they don't have to wait for the connection to be set up."""
+    try:
+        provider = await get_provider()
+        await provider.search(
+            index=settings.ENTITY_INDEX, query={"match_all": {}}, size=1
+        )
+    except Exception as exc:
+        log.warning("Could not warm up the search index: %s" % exc)
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     log.info(
@@ -38,17 +52,26 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
         auto_reindex=settings.AUTO_REINDEX,
     )
     settings.CRON = aiocron.crontab(settings.CRONTAB, func=cron_task)
+    preload_algorithms()
+    start_score_pool()
     if settings.AUTO_REINDEX:
         update_index_threaded()
+    warm_up = asyncio.create_task(warm_up_index())
     yield
+    warm_up.cancel()
     await close_provider()
+    close_score_pool()
 
 
 async def request_middleware(
     request: Request, call_next: RequestResponseEndpoint
 ) -> Response:
     start_time = time.time()
-    client_ip = request.client.host if request.client else "127.0.0.1"
+    # Read straight from the ASGI scope rather than building the Request helpers
+    # (Address, Headers, URL) on every request:
+    scope = request.scope
+    client = scope.get("client")
+    client_ip = client[0] if client else "127.0.0.1"
     bind_contextvars(
         client_ip=client_ip,
     )
@@ -56,16 +79,20 @@ async def request_middleware(
         response = await call_next(request)
     except Exception as exc:
         log.exception("Exception during request: %s" % type(exc))
-        response = JSONResponse(status_code=500, content={"status": "error"})
+        response = ORJSONResponse(status_code=500, content={"status": "error"})
     time_delta = time.time() - start_time
+    headers = dict(scope["headers"])
+    agent = headers.get(b"user-agent")
+    referer = headers.get(b"referer")
+    path: str = scope["path"]
     log.info(
-        str(request.url.path),
+        path,
         action="request",
-        method=request.method,
-        path=request.url.path,
-        query=request.url.query,
-        agent=request.headers.get("user-agent"),
-        referer=request.headers.get("referer"),
+        method=scope["method"],
+        path=path,
+        query=scope["query_string"].decode("latin-1"),
+        agent=agent.decode("latin-1") if agent is not None else None,
+        referer=referer.decode("latin-1") if referer is not None else None,
         code=response.status_code,
         took=time_delta,
     )
@@ -75,14 +102,14 @@ async def request_middleware(
 
 async def yente_error_handler(req: Request, exc: YenteError) -> Response:
     if exc.status > 499:
-        log.exception(f"App error {exc.status}: {exc.detail}")
-    return JSONResponse(status_code=exc.status, content={"detail": exc.detail})
+        log.exception("App error", status=exc.status, detail=exc.detail)
+    return ORJSONResponse(status_code=exc.status, content={"detail": exc.detail})
 
 
 async def validation_error_handler(req: Request, exc: ValidationError) -> Response:
-    log.warn(f"Validation error: {exc}")
+    log.warning("Validation error", error=exc)
     body = {"detail": exc.title, "errors": exc.errors()}
-    return JSONResponse(status_code=400, content=body)
+    return ORJSONResponse(status_code=400, content=body)
 
 
 HANDLERS: Dict[Union[Type[Exception], int], ExceptionHandler] = {
@@ -102,6 +129,7 @@ def create_app() -> FastAPI:
         docs_url=None,
         redoc_url=None,
         lifespan=lifespan,
+        default_response_class=ORJSONResponse,
     )
     app.middleware("http")(request_middleware)
     app.add_middleware(TraceContextMiddleware)
@@ -112,7 +140,9 @@ def create_app() -> FastAPI:
         allow_methods=["*"],
         allow_headers=["*"],
     )
-    app.add_middleware(GZipMiddleware, minimum_size=500)
+    app.add_middleware(
+        GZipMiddleware, minimum_size=500, compresslevel=settings.GZIP_LEVEL
+    )
     app.include_router(match.router)
     app.include_router(search.router)
     app.include_router(reconcile.router)
@@ -0,0 +1,79 @@
+import time
+import asyncio
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Generic, Optional, Tuple, TypeVar
+import orjson
+
+from yente import settings
+
+T = TypeVar("T")
+_inflight: Dict[str, "asyncio.Future[Any]"] = {}
+
+
+class ResultCache(Generic[T]):
+    """A size-bounded in-memory cache for the results of API operations. Entries
+    expire after `ttl` seconds, and the least recently used entries are evicted
+    once there are more than `size` of them."""
+
+    def __init__(self, size: int, ttl: float) -> None:
+        self.size = size
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self.entries: OrderedDict[str, Tuple[float, T]] = OrderedDict()
+
+    @property
+    def enabled(self) -> bool:
+        return self.size > 0 and self.ttl > 0
+
+    def get(self, key: str) -> Optional[T]:
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires < time.monotonic():
+                del self.entries[key]
+                return None
+            self.entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: T) -> None:
+        if not self.enabled:
+            return
+        with self.lock:
+            self.entries[key] = (time.monotonic() + self.ttl, value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.size:
+                self.entries.popitem(last=False)
+
+    def clear(self) -> None:
+        # The indexer runs in its own thread, hence the lock.
+        with self.lock:
+            self.entries.clear()
+
+
+def cache_key(*parts: Any) -> str:
+    """Make a cache key from the JSON-serialisable parameters of an operation."""
+    data = orjson.dumps(parts, option=orjson.OPT_SORT_KEYS)
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+async def single_flight(key: str, func: Callable[[], Awaitable[T]]) -> T:
+    """Run `func` once for all callers which ask for the same key at the same time,
+    and give each of them its result. The operation runs as its own task, so a
+    caller that is cancelled (e.g. because the client went away) does not cancel
+    it for the others."""
+    future = _inflight.get(key)
+    if future is None:
+        future = asyncio.ensure_future(func())
+        _inflight[key] = future
+        future.add_done_callback(lambda _: _inflight.pop(key, None))
+    result: T = await asyncio.shield(future)
+    return result
+
+
+results_cache: ResultCache[Any] = ResultCache(
+    settings.RESULTS_CACHE_SIZE, settings.RESULTS_CACHE_TTL
+)
@@ -1,5 +1,6 @@
 import click
 import asyncio
+from typing import Any, Coroutine
 from uvicorn import Config, Server
 
 from yente import settings
@@ -12,6 +13,17 @@ from yente.provider import with_provider
 log = get_logger("yente")
 
 
+def run_async(coro: Coroutine[Any, Any, None]) -> None:
+    """Run a command on uvloop if it is installed (it comes with uvicorn[standard],
+    which the server already uses), and on the default asyncio loop otherwise."""
+    try:
+        import uvloop
+    except ImportError:
+        asyncio.run(coro)
+        return
+    uvloop.run(coro)
+
+
 @click.group(help="yente API server")
 def cli() -> None:
     pass
@@ -41,7 +53,7 @@ def serve() -> None:
 @click.option("-f", "--force", is_flag=True, default=False)
 def reindex(force: bool) -> None:
     configure_logging()
-    asyncio.run(update_index(force=force))
+    run_async(update_index(force=force))
 
 
 async def _clear_index() -> None:
@@ -55,7 +67,7 @@ async def _clear_index() -> None:
 @cli.command("clear-index", help="Delete everything in ElasticSearch")
 def clear_index() -> None:
     configure_logging()
-    asyncio.run(_clear_index())
+    run_async(_clear_index())
 
 
 if __name__ == "__main__":
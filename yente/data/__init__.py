@@ -10,6 +10,9 @@ lock = asyncio.Lock()
 
 
 async def get_catalog() -> Catalog:
+    # Skip the lock once the catalog is loaded, this runs on every request:
+    if Catalog.instance is not None:
+        return Catalog.instance
     async with lock:
         if Catalog.instance is None:
             Catalog.instance = await Catalog.load()
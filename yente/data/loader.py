@@ -5,13 +5,14 @@ import asyncio
 import aiofiles
 from pathlib import Path
 from itertools import count
-from typing import Any, AsyncGenerator
+from typing import Any, AsyncGenerator, AsyncIterator
 
 from yente import settings
 from yente.logs import get_logger
 from yente.data.util import get_url_local_path, httpx_session
 
 log = get_logger(__name__)
+CHUNK_SIZE = 1024 * 1024
 
 
 async def load_yaml_url(url: str) -> Any:
@@ -50,10 +51,38 @@ async def fetch_url_to_path(url: str, path: Path) -> None:
                     await outfh.write(chunk)
 
 
-async def read_path_lines(path: Path) -> AsyncGenerator[Any, None]:
+async def parse_json_lines(chunks: AsyncIterator[bytes]) -> AsyncGenerator[Any, None]:
+    """Parse a stream of byte chunks as JSON lines. The lines are split from the
+    raw bytes, rather than decoding them to text only for orjson to encode them
+    again."""
+    buffer = bytearray()
+    async for chunk in chunks:
+        # Only the new chunk can hold the end of a line, so a long line is not
+        # scanned again for every chunk it spans:
+        end = chunk.rfind(b"\n")
+        if end == -1:
+            buffer.extend(chunk)
+            continue
+        buffer.extend(chunk[:end])
+        for line in buffer.split(b"\n"):
+            if line.strip():
+                yield orjson.loads(line)
+        buffer = bytearray(chunk[end + 1 :])
+    if buffer.strip():
+        yield orjson.loads(buffer)
+
+
+async def read_path_chunks(path: Path) -> AsyncGenerator[bytes, None]:
+    # Iterating over the lines of an aiofiles handle does a thread round-trip
+    # for every line, so read larger blocks instead:
     async with aiofiles.open(path, "rb") as fh:
-        async for line in fh:
-            yield orjson.loads(line)
+        while chunk := await fh.read(CHUNK_SIZE):
+            yield chunk
+
+
+async def read_path_lines(path: Path) -> AsyncGenerator[Any, None]:
+    async for data in parse_json_lines(read_path_chunks(path)):
+        yield data
 
 
 async def stream_http_lines(url: str) -> AsyncGenerator[Any, None]:
@@ -62,8 +91,8 @@ async def stream_http_lines(url: str) -> AsyncGenerator[Any, None]:
             async with httpx_session() as client:
                 async with client.stream("GET", url) as resp:
                     resp.raise_for_status()
-                    async for line in resp.aiter_lines():
-                        yield orjson.loads(line)
+                    async for data in parse_json_lines(resp.aiter_bytes()):
+                        yield data
                     return
         except httpx.TransportError as exc:
             if retry > 3:
@@ -1,4 +1,4 @@
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Type
 from pydantic import BaseModel
 from nomenklatura.dataset import DataCatalog
 
@@ -54,6 +54,22 @@ class Catalog(DataCatalog[Dataset]):
 
     instance: Optional["Catalog"] = None
 
+    def __init__(self, dataset_type: Type[Dataset], data: Dict[str, Any]) -> None:
+        self._by_name: Dict[str, Dataset] = {}
+        super().__init__(dataset_type, data)
+
+    def add(self, dataset: Dataset) -> None:
+        super().add(dataset)
+        self._by_name.setdefault(dataset.name, dataset)
+
+    def get(self, name: str) -> Optional[Dataset]:
+        # The base class scans the list of datasets, but this runs on every
+        # request and for each dataset facet of a search:
+        return self._by_name.get(name)
+
+    def has(self, name: str) -> bool:
+        return name in self._by_name
+
     @classmethod
     async def load(cls) -> "Catalog":
         manifest = await Manifest.load()
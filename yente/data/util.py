@@ -1,15 +1,19 @@
 import httpx
+import numpy as np
 from pathlib import Path
 from normality import WS
 from urllib.parse import urlparse
 from followthemoney.types import registry
 from prefixdate.precision import Precision
 from contextlib import asynccontextmanager
-from typing import AsyncGenerator, Dict, List, Iterable, Optional, Set, Generator
+from functools import lru_cache
+from typing import AsyncGenerator, List, Iterable, Optional, Set, Generator, Tuple
 from rigour.text.scripts import is_modern_alphabet
-from rigour.text.distance import levenshtein
+from rigour.env import MAX_NAME_LENGTH
 from rigour.text.phonetics import metaphone
 from fingerprints import remove_types, clean_name_light
+from rapidfuzz.distance import Levenshtein
+from rapidfuzz.process import cdist
 from nomenklatura.util import fingerprint_name, names_word_list
 
 from yente import settings
@@ -17,8 +21,9 @@ from yente import settings
 
 def _clean_phonetic(original: str) -> Optional[str]:
     # We're being extra picky what phonemes are put into the search index,
-    # so that we can reduce the number of false positives.
-    if not is_modern_alphabet(original):
+    # so that we can reduce the number of false positives. ASCII text is always
+    # latin, so it doesn't need to be checked character by character.
+    if not original.isascii() and not is_modern_alphabet(original):
         return None
     return fingerprint_name(original)
 
@@ -33,13 +38,23 @@ def expand_dates(dates: List[str]) -> List[str]:
     return list(expanded)
 
 
-def phonetic_names(names: List[str]) -> List[str]:
-    """Generate phonetic forms of the given names."""
+@lru_cache(maxsize=20000)
+def _name_phonemes(name: str) -> Tuple[str, ...]:
+    # Names are normalised as a whole (e.g. to strip company types), so this
+    # caches by name rather than by token.
     phonemes: List[str] = []
-    for word in names_word_list(names, normalizer=_clean_phonetic, min_length=2):
+    for word in names_word_list([name], normalizer=_clean_phonetic, min_length=2):
         token = metaphone(word)
         if len(token) > 2:
             phonemes.append(token)
+    return tuple(phonemes)
+
+
+def phonetic_names(names: List[str]) -> List[str]:
+    """Generate phonetic forms of the given names."""
+    phonemes: List[str] = []
+    for name in names:
+        phonemes.extend(_name_phonemes(name))
     return phonemes
 
 
@@ -93,20 +108,20 @@ def pick_names(names: List[str], limit: int = 3) -> List[str]:
     if picked_name is not None:
         picked.append(picked_name)
 
+    # Compute the distances between all names in one go, rather than pair by pair:
+    unique = list(dict.fromkeys(names))
+    truncated = [n[:MAX_NAME_LENGTH] for n in unique]
+    distances = cdist(truncated, truncated, scorer=Levenshtein.distance)
+    taken = [unique.index(p) for p in picked]
+
     # Pick the least similar:
     for _ in range(1, limit):
-        candidates: Dict[str, int] = {}
-        for cand in names:
-            if cand in picked:
-                continue
-            candidates[cand] = 0
-            for pick in picked:
-                candidates[cand] += levenshtein(pick, cand)
-
-        if not len(candidates):
+        if len(taken) >= len(unique):
             break
-        pick, _ = sorted(candidates.items(), key=lambda c: c[1], reverse=True)[0]
-        picked.append(pick)
+        totals = distances[taken].sum(axis=0, dtype=np.int64)
+        totals[taken] = -1
+        taken.append(int(totals.argmax()))
+        picked.append(unique[taken[-1]])
 
     return picked
 
@@ -1,11 +1,16 @@
 import sys
+import atexit
 import logging
+import contextvars
+from datetime import datetime, timezone
 import structlog
+from queue import SimpleQueue
 from logging import Filter, LogRecord
-from typing import Any, Dict, List
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, List, Optional
 from structlog.dev import ConsoleRenderer, set_exc_info
 from structlog.contextvars import merge_contextvars
-from structlog.processors import UnicodeDecoder, TimeStamper
+from structlog.processors import UnicodeDecoder
 from structlog.processors import format_exc_info, add_log_level
 from structlog.processors import JSONRenderer
 from structlog.stdlib import ProcessorFormatter, add_logger_name
@@ -14,6 +19,8 @@ from structlog.stdlib import get_logger as get_raw_logger
 
 from yente import settings
 
+_listener: Optional[QueueListener] = None
+
 
 def get_logger(name: str) -> BoundLogger:
     return get_raw_logger(name)
@@ -28,7 +35,7 @@ def configure_logging(level: int = logging.INFO) -> None:
         # structlog.processors.StackInfoRenderer(),
         merge_contextvars,
         set_exc_info,
-        TimeStamper(fmt="iso"),
+        add_timestamp,
         # format_exc_info,
         UnicodeDecoder(),
     ]
@@ -49,6 +56,7 @@ def configure_logging(level: int = logging.INFO) -> None:
         )
 
     processors = shared_processors + [
+        capture_exc_info,
         ProcessorFormatter.wrap_for_formatter,
     ]
 
@@ -83,10 +91,27 @@ def configure_logging(level: int = logging.INFO) -> None:
     error_handler.setLevel(logging.ERROR)
     error_handler.setFormatter(formatter)
 
+    # Rendering and writing the log lines happens in a background thread, so that
+    # it doesn't hold up the event loop of the API server:
+    global _listener
+    queue: "SimpleQueue[LogRecord]" = SimpleQueue()
+    _listener = _ContextQueueListener(
+        queue, out_handler, error_handler, respect_handler_level=True
+    )
+    _listener.start()
+    atexit.register(stop_logging)
+
     root_logger = logging.getLogger()
     root_logger.setLevel(settings.LOG_LEVEL)
-    root_logger.addHandler(out_handler)
-    root_logger.addHandler(error_handler)
+    root_logger.addHandler(_RecordQueueHandler(queue))
+
+
+def stop_logging() -> None:
+    """Write out the queued log lines and stop the thread that writes them."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
 
 
 def format_json(_: Any, __: Any, ed: Dict[str, str]) -> Dict[str, str]:
@@ -96,9 +121,48 @@ def format_json(_: Any, __: Any, ed: Dict[str, str]) -> Dict[str, str]:
     return ed
 
 
+def add_timestamp(_: Any, __: Any, ed: Dict[str, Any]) -> Dict[str, Any]:
+    """Log lines are rendered on the queue listener thread, so records from the
+    standard library loggers are stamped with the time they were created, not the
+    time they are rendered. structlog events are stamped before they are queued."""
+    record: Optional[LogRecord] = ed.get("_record")
+    if record is not None:
+        dt = datetime.fromtimestamp(record.created, timezone.utc)
+    else:
+        dt = datetime.now(timezone.utc)
+    ed["timestamp"] = dt.isoformat().replace("+00:00", "Z")
+    return ed
+
+
+def capture_exc_info(_: Any, __: Any, ed: Dict[str, Any]) -> Dict[str, Any]:
+    """Log lines are rendered on the queue listener thread, where the exception
+    being logged is no longer active, so it needs to be fetched here."""
+    if ed.get("exc_info") is True:
+        ed["exc_info"] = sys.exc_info()
+    return ed
+
+
 class _MaxLevelFilter(Filter):
     def __init__(self, highest_log_level: int) -> None:
         self._highest_log_level = highest_log_level
 
     def filter(self, log_record: LogRecord) -> bool:
         return log_record.levelno <= self._highest_log_level
+
+
+class _RecordQueueHandler(QueueHandler):
+    def prepare(self, record: LogRecord) -> LogRecord:
+        # The default pre-formats the message, but the structlog formatter on the
+        # output handlers needs the event dict as it was logged. Records from other
+        # libraries have the context variables merged in by the formatter, so the
+        # context of the logging call is kept for that:
+        setattr(record, "_log_context", contextvars.copy_context())
+        return record
+
+
+class _ContextQueueListener(QueueListener):
+    def handle(self, record: LogRecord) -> None:
+        context = getattr(record, "_log_context", None)
+        if context is None:
+            return super().handle(record)
+        context.run(super().handle, record)
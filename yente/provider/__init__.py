@@ -13,6 +13,7 @@ log = get_logger(__name__)
 __all__ = ["with_provider", "get_provider", "close_provider", "SearchProvider"]
 
 PROVIDERS: dict[int, SearchProvider] = {}
+PROVIDER_LOCKS: dict[int, asyncio.Lock] = {}
 
 
 def get_id() -> int:
@@ -30,13 +31,21 @@ async def _create_provider() -> SearchProvider:
 async def get_provider() -> SearchProvider:
     """Get the search provider for the current event loop, or create it."""
     loop_id = get_id()
-    if loop_id not in PROVIDERS:
-        PROVIDERS[loop_id] = await _create_provider()
+    provider = PROVIDERS.get(loop_id)
+    if provider is not None:
+        return provider
+    # Connecting takes a while, so requests which arrive in the meantime wait for
+    # the first one rather than each creating (and leaking) their own client:
+    lock = PROVIDER_LOCKS.setdefault(loop_id, asyncio.Lock())
+    async with lock:
+        if loop_id not in PROVIDERS:
+            PROVIDERS[loop_id] = await _create_provider()
     return PROVIDERS[loop_id]
 
 
 async def close_provider() -> None:
     loop_id = get_id()
+    PROVIDER_LOCKS.pop(loop_id, None)
     provider = PROVIDERS.pop(loop_id, None)
     if provider:
         await provider.close()
@@ -3,6 +3,7 @@ from typing import Any, Dict, List, Optional
 from typing import AsyncIterator
 
 from yente import settings
+from yente.exc import IndexNotReadyError, YenteIndexError
 
 query_semaphore = Semaphore(settings.QUERY_CONCURRENCY)
 
@@ -60,6 +61,35 @@ class SearchProvider(object):
         """Search for entities in the index."""
         raise NotImplementedError
 
+    async def msearch(
+        self,
+        index: str,
+        queries: List[Dict[str, Any]],
+        size: Optional[int] = None,
+        rank_precise: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """Run a batch of entity queries in a single request to the index, and
+        return the responses in the order of the queries."""
+        raise NotImplementedError
+
     async def bulk_index(self, entities: AsyncIterator[Dict[str, Any]]) -> None:
         """Index a list of entities into the search index."""
         raise NotImplementedError
+
+
+def check_msearch_response(index: str, response: Dict[str, Any]) -> Dict[str, Any]:
+    """Raise the errors that are reported for individual queries of an msearch
+    request, instead of failing the request as a whole."""
+    error = response.get("error")
+    if error is None:
+        return response
+    error_type = error.get("type") if isinstance(error, dict) else None
+    if error_type == "index_not_found_exception":
+        msg = (
+            f"Index {index} does not exist. This may be caused by a misconfiguration,"
+            " or the initial ingestion of data is still ongoing."
+        )
+        raise IndexNotReadyError(msg)
+    if error_type == "search_phase_execution_exception":
+        raise YenteIndexError(f"Search error: {error}", status=400)
+    raise YenteIndexError(f"Could not search index: {error}")
@@ -1,9 +1,11 @@
 import json
+import orjson
 import asyncio
 import warnings
 from typing import Any, Dict, List, Optional, cast
 from typing import AsyncIterator
 from elasticsearch import AsyncElasticsearch, ElasticsearchWarning
+from elasticsearch.serializer import OrjsonSerializer, NdjsonSerializer
 from elasticsearch.helpers import async_bulk, BulkIndexError
 from elasticsearch import ApiError, NotFoundError
 from elasticsearch import TransportError, ConnectionError
@@ -13,12 +15,23 @@ from yente.exc import IndexNotReadyError, YenteIndexError, YenteNotFoundError
 from yente.logs import get_logger
 from yente.search.mapping import make_entity_mapping, INDEX_SETTINGS
 from yente.provider.base import SearchProvider, query_semaphore
+from yente.provider.base import check_msearch_response
 from yente.middleware.trace_context import get_trace_context
 
 log = get_logger(__name__)
 warnings.filterwarnings("ignore", category=ElasticsearchWarning)
 
 
+class OrjsonNdjsonSerializer(NdjsonSerializer):
+    """Encode the lines of bulk and msearch request bodies with orjson."""
+
+    def json_dumps(self, data: Any) -> bytes:
+        return orjson.dumps(data, default=self.default)
+
+    def json_loads(self, data: bytes) -> Any:
+        return orjson.loads(data)
+
+
 class ElasticSearchProvider(SearchProvider):
     @classmethod
     async def create(cls) -> "ElasticSearchProvider":
@@ -27,6 +40,14 @@ class ElasticSearchProvider(SearchProvider):
             request_timeout=30,
             retry_on_timeout=True,
             max_retries=10,
+            # Keep enough connections open to run all concurrent queries at once:
+            connections_per_node=settings.QUERY_CONCURRENCY,
+            # Encode requests and decode responses with orjson. Bulk and msearch
+            # bodies are newline-delimited, which has its own serializer:
+            serializers={
+                OrjsonSerializer.mimetype: OrjsonSerializer(),
+                OrjsonNdjsonSerializer.mimetype: OrjsonNdjsonSerializer(),
+            },
         )
         if settings.INDEX_SNIFF:
             kwargs["sniff_on_start"] = True
@@ -238,6 +259,58 @@ class ElasticSearchProvider(SearchProvider):
             msg = f"Error during search: {str(exc)}"
             raise YenteIndexError(msg, status=500) from exc
 
+    async def msearch(
+        self,
+        index: str,
+        queries: List[Dict[str, Any]],
+        size: Optional[int] = None,
+        rank_precise: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """Run a batch of entity queries in a single request to the index, and
+        return the responses in the order of the queries."""
+        search_type = "dfs_query_then_fetch" if rank_precise else None
+        searches: List[Dict[str, Any]] = []
+        for query in queries:
+            search: Dict[str, Any] = {"query": query}
+            # Leave out the size to get the default of the index:
+            if size is not None:
+                search["size"] = size
+            searches.append({})
+            searches.append(search)
+        try:
+            async with query_semaphore:
+                response = await self.client().msearch(
+                    index=index,
+                    searches=searches,
+                    search_type=search_type,
+                )
+                responses = cast(List[Dict[str, Any]], response.body["responses"])
+        except TransportError as te:
+            log.warning(
+                f"Backend connection error: {te.message}",
+                errors=te.errors,
+            )
+            raise YenteIndexError(f"Could not connect to index: {te.message}") from te
+        except ApiError as ae:
+            if ae.error == "index_not_found_exception":
+                msg = (
+                    f"Index {index} does not exist. This may be caused by a misconfiguration,"
+                    " or the initial ingestion of data is still ongoing."
+                )
+                raise IndexNotReadyError(msg) from ae
+            log.warning(f"API error {ae.status_code}: {ae.message}", index=index)
+            raise YenteIndexError(f"Could not search index: {ae}") from ae
+        except (
+            KeyboardInterrupt,
+            OSError,
+            Exception,
+            asyncio.TimeoutError,
+            asyncio.CancelledError,
+        ) as exc:
+            msg = f"Error during search: {str(exc)}"
+            raise YenteIndexError(msg, status=500) from exc
+        return [check_msearch_response(index, r) for r in responses]
+
     async def bulk_index(self, entities: AsyncIterator[Dict[str, Any]]) -> None:
         """Index a list of entities into the search index."""
         try:
@@ -1,4 +1,5 @@
 import json
+import orjson
 import asyncio
 import logging
 from typing import Any, Dict, List, Optional, cast
@@ -6,17 +7,39 @@ from typing import AsyncIterator
 from opensearchpy import AsyncOpenSearch, AWSV4SignerAsyncAuth
 from opensearchpy.helpers import async_bulk, BulkIndexError
 from opensearchpy.exceptions import NotFoundError, TransportError
+from opensearchpy.serializer import JSONSerializer
+from opensearchpy.exceptions import SerializationError
 
 from yente import settings
 from yente.exc import IndexNotReadyError, YenteIndexError, YenteNotFoundError
 from yente.logs import get_logger
 from yente.search.mapping import make_entity_mapping, INDEX_SETTINGS
 from yente.provider.base import SearchProvider, query_semaphore
+from yente.provider.base import check_msearch_response
 
 log = get_logger(__name__)
 logging.getLogger("opensearch").setLevel(logging.ERROR)
 
 
+class OrjsonSerializer(JSONSerializer):
+    """Encode bulk index actions and decode search responses with orjson."""
+
+    def loads(self, s: Any) -> Any:
+        try:
+            return orjson.loads(s)
+        except orjson.JSONDecodeError as e:
+            raise SerializationError(s, e)
+
+    def dumps(self, data: Any) -> Any:
+        # don't serialize strings
+        if isinstance(data, str):
+            return data
+        try:
+            return orjson.dumps(data, default=self.default).decode("utf-8")
+        except TypeError as e:
+            raise SerializationError(data, e)
+
+
 class OpenSearchProvider(SearchProvider):
     @classmethod
     async def create(cls) -> "OpenSearchProvider":
@@ -26,6 +49,9 @@ class OpenSearchProvider(SearchProvider):
             retry_on_timeout=True,
             max_retries=10,
             hosts=[settings.INDEX_URL],
+            # Keep enough connections open to run all concurrent queries at once:
+            maxsize=settings.QUERY_CONCURRENCY,
+            serializer=OrjsonSerializer(),
             # connection_class=AsyncHttpConnection,
         )
         if settings.INDEX_SNIFF:
@@ -229,6 +255,52 @@ class OpenSearchProvider(SearchProvider):
             msg = f"Error during search: {str(exc)}"
             raise YenteIndexError(msg, status=500) from exc
 
+    async def msearch(
+        self,
+        index: str,
+        queries: List[Dict[str, Any]],
+        size: Optional[int] = None,
+        rank_precise: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """Run a batch of entity queries in a single request to the index, and
+        return the responses in the order of the queries."""
+        search_type = "dfs_query_then_fetch" if rank_precise else None
+        body: List[Dict[str, Any]] = []
+        for query in queries:
+            search: Dict[str, Any] = {"query": query}
+            # Leave out the size to get the default of the index:
+            if size is not None:
+                search["size"] = size
+            body.append({})
+            body.append(search)
+        try:
+            async with query_semaphore:
+                response = await self.client.msearch(
+                    index=index,
+                    body=body,
+                    search_type=search_type,
+                )
+                responses = cast(List[Dict[str, Any]], response["responses"])
+        except TransportError as ae:
+            if ae.error == "index_not_found_exception":
+                msg = (
+                    f"Index {index} does not exist. This may be caused by a misconfiguration,"
+                    " or the initial ingestion of data is still ongoing."
+                )
+                raise IndexNotReadyError(msg) from ae
+            log.warning(f"API error {ae.status_code}: {ae.error}", index=index)
+            raise YenteIndexError(f"Could not search index: {ae}") from ae
+        except (
+            KeyboardInterrupt,
+            OSError,
+            Exception,
+            asyncio.TimeoutError,
+            asyncio.CancelledError,
+        ) as exc:
+            msg = f"Error during search: {str(exc)}"
+            raise YenteIndexError(msg, status=500) from exc
+        return [check_msearch_response(index, r) for r in responses]
+
     async def bulk_index(self, entities: AsyncIterator[Dict[str, Any]]) -> None:
         """Index a list of entities into the search index."""
         try:
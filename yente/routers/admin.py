@@ -1,12 +1,14 @@
+from functools import partial
 from typing import List
 from fastapi import APIRouter, Depends, Query
-from fastapi import HTTPException
+from fastapi import HTTPException, Response
 from fastapi.openapi.docs import get_redoc_html
 from fastapi.responses import FileResponse, HTMLResponse
 from normality import collapse_spaces
 from nomenklatura.matching import ALGORITHMS
 
 from yente import settings
+from yente.cache import cache_key, single_flight
 from yente.logs import get_logger
 from yente.data import get_catalog
 from yente.data.common import ErrorResponse, StatusResponse
@@ -14,10 +16,15 @@ from yente.data.common import DataCatalogModel, AlgorithmResponse, Algorithm
 from yente.provider import SearchProvider, get_provider
 from yente.search.indexer import update_index, update_index_threaded
 from yente.search.status import sync_dataset_versions
+from yente.scoring import explain_algorithm
 
 log = get_logger(__name__)
 router = APIRouter()
 
+# Health checks are polled constantly by cluster managers, so the body is only
+# serialised once:
+HEALTHZ_OK = StatusResponse(status="ok").model_dump_json()
+
 
 @router.get(
     "/",
@@ -42,10 +49,10 @@ async def redoc_html() -> HTMLResponse:
     response_model=StatusResponse,
     responses={500: {"model": ErrorResponse, "description": "Service is not ready"}},
 )
-async def healthz() -> StatusResponse:
+async def healthz() -> Response:
     """No-op basic health check. This is used by cluster management systems like
     Kubernetes to verify the service is responsive."""
-    return StatusResponse(status="ok")
+    return Response(content=HEALTHZ_OK, media_type="application/json")
 
 
 @router.get(
@@ -60,7 +67,11 @@ async def readyz(
 ) -> StatusResponse:
     """Search index health check. This is used to know if the service has completed
     its index building."""
-    ok = await provider.check_health(index=settings.ENTITY_INDEX)
+    # Probes from several replicas arrive at the same time, so they share one call
+    # to the index:
+    key = cache_key("readyz", settings.ENTITY_INDEX)
+    check = partial(provider.check_health, index=settings.ENTITY_INDEX)
+    ok = await single_flight(key, check)
     if not ok:
         raise HTTPException(503, detail="Index not ready.")
     return StatusResponse(status="ok")
@@ -114,7 +125,7 @@ async def algorithms() -> AlgorithmResponse:
         desc = Algorithm(
             name=algo.NAME,
             description=collapse_spaces(algo.__doc__),
-            features=algo.explain(),
+            features=explain_algorithm(algo),
         )
         algorithms.append(desc)
     return AlgorithmResponse(
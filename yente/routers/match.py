@@ -4,16 +4,18 @@ from fastapi import APIRouter, Depends, Query, Response, HTTPException
 
 from yente import settings
 from yente.logs import get_logger
+from yente.cache import cache_key, results_cache
 from yente.data.common import ErrorResponse
 from yente.data.common import EntityMatchQuery, EntityMatchResponse, EntityExample
 from yente.data.common import EntityMatches, TotalSpec
 from yente.provider import SearchProvider, get_provider
 from yente.search.queries import entity_query, FilterDict
-from yente.search.search import search_entities, result_entities
+from yente.search.search import msearch_entities, result_entities
+from yente.search.status import get_index_state
 from yente.data.entity import Entity
 from yente.util import limit_window
-from yente.scoring import score_results
-from yente.routers.util import get_dataset, get_algorithm_by_name
+from yente.scoring import explain_algorithm, score_results_pooled
+from yente.routers.util import get_dataset, get_algorithm_by_name, json_response
 from yente.routers.util import PATH_DATASET, TS_PATTERN, ALGO_HELP
 
 log = get_logger(__name__)
@@ -70,7 +72,7 @@ async def match(
         title="Match against entities that were updated since the given date",
     ),
     provider: SearchProvider = Depends(get_provider),
-) -> EntityMatchResponse:
+) -> Response:
     """Match entities based on a complex set of criteria, like name, date of birth
     and nationality of a person. This works by submitting a batch of entities, each
     formatted like those returned by the API.
@@ -134,9 +136,30 @@ async def match(
         msg = "Too many queries in one batch (limit: %d)" % settings.MAX_BATCH
         raise HTTPException(400, detail=msg)
 
+    # Results are cached per example, so that an entry stays small and the
+    # examples which recur across different batches are found again:
+    params = (
+        "match",
+        await get_index_state(provider),
+        ds.name,
+        limit,
+        threshold,
+        cutoff,
+        algorithm_type.NAME,
+        match.weights,
+        include_dataset,
+        exclude_schema,
+        exclude_dataset,
+        topics,
+        fuzzy,
+        changed_since,
+    )
     filters: FilterDict = {"topics": topics}
     queries = []
-    entities = []
+    # Identical examples in one batch are only queried and scored once:
+    examples: Dict[str, str] = {}
+    entities: Dict[str, Entity] = {}
+    matches: Dict[str, EntityMatches] = {}
     responses: Dict[str, EntityMatches] = {}
 
     for name, example in match.queries.items():
@@ -144,6 +167,15 @@ async def match(
             continue
         try:
             entity = Entity.from_example(example)
+            # The key is made from the parsed entity, whose values are all strings:
+            example_key = cache_key(*params, entity.to_dict())
+            examples[name] = example_key
+            if example_key in entities or example_key in matches:
+                continue
+            cached: Optional[EntityMatches] = results_cache.get(example_key)
+            if cached is not None:
+                matches[example_key] = cached
+                continue
             query = entity_query(
                 ds,
                 entity,
@@ -160,43 +192,55 @@ async def match(
                 status_code=400,
                 detail=f"Cannot parse example entity: {exc}",
             )
-        # We're using a higher limit for candidate generation, because we want to
-        # get a broad range of candidates to score against. This is a trade-off
-        # between speed and accuracy.
-        candidates = limit * settings.MATCH_CANDIDATES
-        candidates = max(20, min(settings.MAX_RESULTS, candidates))
-        queries.append(search_entities(provider, query, limit=candidates))
-        entities.append((name, entity))
-    if not len(queries) and not len(responses):
+        queries.append(query)
+        entities[example_key] = entity
+    if not len(examples):
         raise HTTPException(400, detail="No queries provided.")
-    results = await asyncio.gather(*queries)
 
-    for (name, entity), resp in zip(entities, results):
-        ents = result_entities(resp)
-        total, scored = score_results(
+    # We're using a higher limit for candidate generation, because we want to
+    # get a broad range of candidates to score against. This is a trade-off
+    # between speed and accuracy.
+    candidates = limit * settings.MATCH_CANDIDATES
+    candidates = max(20, min(settings.MAX_RESULTS, candidates))
+    # All examples of a batch are sent to the index in one request:
+    results = []
+    if len(queries):
+        results = await msearch_entities(provider, queries, limit=candidates)
+
+    scorings = []
+    for entity, resp in zip(entities.values(), results):
+        scoring = score_results_pooled(
             algorithm_type,
             entity,
-            ents,
+            result_entities(resp),
             threshold=threshold,
             cutoff=cutoff,
             limit=limit,
             weights=match.weights,
         )
+        scorings.append(scoring)
+    scoreds = await asyncio.gather(*scorings)
+
+    for (example_key, entity), (total, scored) in zip(entities.items(), scoreds):
         log.info(
             f"/match/{ds.name}",
             action="match",
             schema=entity.schema.name,
             results=total,
         )
-        responses[name] = EntityMatches(
+        matches[example_key] = EntityMatches(
             status=200,
             results=scored,
             total=TotalSpec(value=total, relation="eq"),
             query=EntityExample.model_validate(entity.to_dict()),
         )
+        results_cache.set(example_key, matches[example_key])
+    for name, example_key in examples.items():
+        responses[name] = matches[example_key]
     response.headers["x-batch-size"] = str(len(responses))
-    return EntityMatchResponse(
+    output = EntityMatchResponse(
         responses=responses,
-        matcher=algorithm_type.explain(),
+        matcher=explain_algorithm(algorithm_type),
         limit=limit,
     )
+    return json_response(response, output)
@@ -1,17 +1,21 @@
 import json
 import asyncio
+from itertools import islice
+from functools import cache
 from urllib.parse import urljoin
-from typing import Any, Coroutine, Dict, List, Tuple, Optional, Union
+from typing import Any, Dict, List, Tuple, Optional, Union
 from fastapi import APIRouter, Query, Form, Depends
 from fastapi import Request, Response
 from fastapi import HTTPException
 from followthemoney import model
+from followthemoney.property import Property
 from followthemoney.types import registry
 
 
 from yente import settings
 from yente.data.common import ErrorResponse, EntityExample
 from yente.logs import get_logger
+from yente.cache import cache_key, results_cache
 from yente.data.entity import Entity
 from yente.data.dataset import Dataset
 from yente.data.freebase import (
@@ -44,16 +48,19 @@ from yente.search.queries import entity_query, prefix_query
 from yente.search.search import (
     get_entity,
     search_entities,
+    msearch_entities,
     result_entities,
     result_total,
 )
 from yente.search.search import get_matchable_schemata
+from yente.search.status import get_index_state
 from yente.provider import SearchProvider, get_provider
-from yente.scoring import score_results
+from yente.scoring import score_results_pooled
 from yente.util import EntityRedirect, match_prefix, limit_window, typed_url
 from yente.routers.util import PATH_DATASET, QUERY_PREFIX
 from yente.routers.util import TS_PATTERN, ALGO_HELP
-from yente.routers.util import get_algorithm_by_name, get_dataset
+from yente.routers.util import get_algorithm_by_name, get_dataset, check_etag
+from yente.routers.util import json_response
 
 
 log = get_logger(__name__)
@@ -72,9 +79,10 @@ router = APIRouter()
 )
 async def reconcile(
     request: Request,
+    response: Response,
     dataset: str = PATH_DATASET,
     provider: SearchProvider = Depends(get_provider),
-) -> FreebaseManifest:
+) -> Response:
     """Reconciliation API, emulates Google Refine API. This endpoint can be used
     to bulk match entities against the system using an end-user application like
     [OpenRefine](https://openrefine.org). The reconciliation API uses the same
@@ -85,6 +93,15 @@ async def reconcile(
     Tutorial: [Using OpenRefine to match entities in a spreadsheet](https://www.opensanctions.org/articles/2022-01-10-openrefine-reconciliation/).
     """
     ds = await get_dataset(dataset)
+    index_state = await get_index_state(provider)
+    if (not_modified := check_etag(request, response, index_state)) is not None:
+        return not_modified
+    # OpenRefine fetches the manifest every time the service is used, but it only
+    # changes with the index:
+    key = cache_key("manifest", str(request.url), index_state)
+    cached: Optional[FreebaseManifest] = results_cache.get(key)
+    if cached is not None:
+        return json_response(response, cached)
     base_url = typed_url(urljoin(str(request.base_url), f"/reconcile/{dataset}"))
     schemata = await get_matchable_schemata(provider, ds)
     # Pass on query string (useful for API keys)
@@ -92,7 +109,7 @@ async def reconcile(
     if len(query_string):
         query_string = f"?{query_string}"
 
-    return FreebaseManifest(
+    manifest = FreebaseManifest(
         versions=["0.2"],
         name=f"{ds.title} ({settings.TITLE})",
         identifierSpace=typed_url("https://www.opensanctions.org/reference/#schema"),
@@ -147,6 +164,8 @@ async def reconcile(
         ),
         defaultTypes=[FreebaseType.from_schema(s) for s in schemata],
     )
+    results_cache.set(key, manifest)
+    return json_response(response, manifest)
 
 
 @router.post(
@@ -175,18 +194,18 @@ async def reconcile_post(
         title="Match against entities that were updated since the given date",
     ),
     provider: SearchProvider = Depends(get_provider),
-) -> Union[Dict[str, FreebaseEntityResult], FreebaseExtendResponse]:
+) -> Response:
     """Reconciliation API, emulates Google Refine API. This endpoint is used by
     clients for matching, refer to the discovery endpoint for details."""
     if extend is not None and len(extend.strip()):
         extend_resp = await reconcile_extend(provider, extend)
         response.headers["x-batch-size"] = str(len(extend_resp.rows))
-        return extend_resp
+        return json_response(response, extend_resp)
 
     ds = await get_dataset(dataset)
     resp = await reconcile_queries(provider, ds, queries, algorithm, changed_since)
     response.headers["x-batch-size"] = str(len(resp))
-    return resp
+    return json_response(response, resp)
 
 
 async def reconcile_queries(
@@ -206,24 +225,60 @@ async def reconcile_queries(
         msg = "Too many queries in one batch (limit: %d)" % settings.MAX_BATCH
         raise HTTPException(400, detail=msg)
 
-    tasks: List[Coroutine[Any, Any, Tuple[str, FreebaseEntityResult]]] = []
-    for k, q in queries.items():
-        task = reconcile_query(provider, k, dataset, q, algorithm, changed_since)
-        tasks.append(task)
-    results: List[Tuple[str, FreebaseEntityResult]] = await asyncio.gather(*tasks)
-    return dict(results)
-
-
-async def reconcile_query(
-    provider: SearchProvider,
-    name: str,
+    algorithm_ = get_algorithm_by_name(algorithm)
+    index_state = await get_index_state(provider)
+    keys: Dict[str, str] = {}
+    results: Dict[str, FreebaseEntityResult] = {}
+    examples: Dict[str, Tuple[Entity, int]] = {}
+    searches: List[Dict[str, Any]] = []
+    for name, query in queries.items():
+        key, proxy, limit, search = reconcile_query(
+            dataset, query, algorithm_.NAME, changed_since, index_state
+        )
+        keys[name] = key
+        if key in results or key in examples:
+            continue
+        cached: Optional[FreebaseEntityResult] = results_cache.get(key)
+        if cached is not None:
+            results[key] = cached
+            continue
+        examples[key] = (proxy, limit)
+        searches.append(search)
+
+    if len(searches):
+        # All queries of a batch are sent to the index in one request. That
+        # takes one size for all of them, so each is cut back to its own limit:
+        size = max(limit for _, limit in examples.values())
+        responses = await msearch_entities(provider, searches, limit=size)
+        scorings = []
+        for (proxy, limit), resp in zip(examples.values(), responses):
+            entities = islice(result_entities(resp), limit)
+            scoring = score_results_pooled(algorithm_, proxy, entities, limit=limit)
+            scorings.append(scoring)
+        scoreds = await asyncio.gather(*scorings)
+        for (key, (proxy, _)), (total, scored) in zip(examples.items(), scoreds):
+            log.info(
+                f"/reconcile/{dataset.name}",
+                action="reconcile",
+                schema=proxy.schema.name,
+                matches=total,
+            )
+            entries = [FreebaseScoredEntity.from_scored(s) for s in scored]
+            results[key] = FreebaseEntityResult(result=entries)
+            results_cache.set(key, results[key])
+    return {name: results[key] for name, key in keys.items()}
+
+
+def reconcile_query(
     dataset: Dataset,
     query: Dict[str, Any],
     algorithm: str,
     changed_since: Optional[str],
-) -> Tuple[str, FreebaseEntityResult]:
-    """Reconcile operation for a single query."""
-    limit, offset = limit_window(query.get("limit"), 0, settings.MAX_MATCHES)
+    index_state: str,
+) -> Tuple[str, Entity, int, Dict[str, Any]]:
+    """Parse a single reconciliation query into its cache key, the example
+    entity, the number of results to return and the index query."""
+    limit, _ = limit_window(query.get("limit"), 0, settings.MAX_MATCHES)
     schema = query.get("type", settings.BASE_SCHEMA)
     properties: Dict[str, List[str]] = {"alias": [query.get("query", "")]}
 
@@ -238,21 +293,20 @@ async def reconcile_query(
     example = EntityExample(id=None, schema=schema, properties=dict(properties))
     try:
         proxy = Entity.from_example(example)
-        query = entity_query(dataset, proxy, fuzzy=False, changed_since=changed_since)
+        # The key is made from the parsed entity, whose values are all strings:
+        key = cache_key(
+            "reconcile",
+            index_state,
+            dataset.name,
+            proxy.to_dict(),
+            limit,
+            algorithm,
+            changed_since,
+        )
+        search = entity_query(dataset, proxy, fuzzy=False, changed_since=changed_since)
     except Exception as exc:
         raise HTTPException(400, detail=str(exc))
-    resp = await search_entities(provider, query, limit=limit, offset=offset)
-    algorithm_ = get_algorithm_by_name(algorithm)
-    entities = result_entities(resp)
-    total, scoreds = score_results(algorithm_, proxy, entities, limit=limit)
-    results = [FreebaseScoredEntity.from_scored(s) for s in scoreds]
-    log.info(
-        f"/reconcile/{dataset.name}",
-        action="reconcile",
-        schema=proxy.schema.name,
-        matches=total,
-    )
-    return name, FreebaseEntityResult(result=results)
+    return key, proxy, limit, search
 
 
 async def reconcile_extend(
@@ -312,6 +366,8 @@ async def reconcile_extend(
     include_in_schema=False,
 )
 async def reconcile_suggest_entity(
+    request: Request,
+    response: Response,
     dataset: str = PATH_DATASET,
     prefix: str = QUERY_PREFIX,
     limit: int = Query(
@@ -320,7 +376,7 @@ async def reconcile_suggest_entity(
         le=settings.MAX_PAGE,
     ),
     provider: SearchProvider = Depends(get_provider),
-) -> FreebaseEntitySuggestResponse:
+) -> Union[FreebaseEntitySuggestResponse, Response]:
     """Suggest an entity based on a text query. This is functionally very
     similar to the basic search API, but returns data in the structure assumed
     by the community specification.
@@ -328,9 +384,16 @@ async def reconcile_suggest_entity(
     Searches are conducted based on name and text content, using all matchable
     entities in the system index."""
     ds = await get_dataset(dataset)
+    index_state = await get_index_state(provider)
+    if (not_modified := check_etag(request, response, index_state)) is not None:
+        return not_modified
+    limit, offset = limit_window(limit, 0, settings.MATCH_PAGE)
+    key = cache_key("suggest_entity", index_state, ds.name, prefix, limit)
+    cached: Optional[FreebaseEntitySuggestResponse] = results_cache.get(key)
+    if cached is not None:
+        return cached
     results = []
     query = prefix_query(ds, prefix)
-    limit, offset = limit_window(limit, 0, settings.MATCH_PAGE)
     resp = await search_entities(provider, query, limit=limit, offset=offset)
     for result in result_entities(resp):
         results.append(FreebaseEntity.from_proxy(result))
@@ -341,7 +404,9 @@ async def reconcile_suggest_entity(
         dataset=ds.name,
         results=result_total(resp).value,
     )
-    return FreebaseEntitySuggestResponse(prefix=prefix, result=results)
+    output = FreebaseEntitySuggestResponse(prefix=prefix, result=results)
+    results_cache.set(key, output)
+    return output
 
 
 @router.get(
@@ -352,25 +417,44 @@ async def reconcile_suggest_entity(
     include_in_schema=False,
 )
 async def reconcile_suggest_property(
+    request: Request,
+    response: Response,
     dataset: str = PATH_DATASET,
     prefix: str = QUERY_PREFIX,
     provider: SearchProvider = Depends(get_provider),
-) -> FreebasePropertySuggestResponse:
+) -> Union[FreebasePropertySuggestResponse, Response]:
     """Given a search prefix, return all the type/schema properties which match
     the given text. This is used to auto-complete property selection for detail
     filters in OpenRefine."""
     ds = await get_dataset(dataset)
+    index_state = await get_index_state(provider)
+    if (not_modified := check_etag(request, response, index_state)) is not None:
+        return not_modified
     schemata = await get_matchable_schemata(provider, ds)
     matches: List[FreebaseProperty] = []
-    for prop in model.properties:
-        if prop.schema not in schemata:
-            continue
-        if prop.hidden or prop.type == prop.type == registry.entity:
+    needle = prefix.lower().strip()
+    for prop, (name, label) in suggest_properties():
+        if not len(needle) or len(matches) >= settings.MATCH_PAGE:
+            break
+        if not name.startswith(needle) and not label.startswith(needle):
             continue
-        if match_prefix(prefix, prop.name, prop.label):
+        if prop.schema in schemata:
             matches.append(FreebaseProperty.from_prop(prop))
-    result = matches[: settings.MATCH_PAGE]
-    return FreebasePropertySuggestResponse(prefix=prefix, result=result)
+    return FreebasePropertySuggestResponse(prefix=prefix, result=matches)
+
+
+@cache
+def suggest_properties() -> List[Tuple[Property, Tuple[str, str]]]:
+    """Properties which can be offered as detail filters, with the lower-cased
+    name and label that search prefixes are matched against. The model doesn't
+    change while the server runs, so this is only computed once."""
+    props: List[Tuple[Property, Tuple[str, str]]] = []
+    for prop in model.properties:
+        if prop.hidden or prop.type == registry.entity:
+            continue
+        labels = (prop.name.lower().strip(), prop.label.lower().strip())
+        props.append((prop, labels))
+    return props
 
 
 @router.get(
@@ -381,20 +465,26 @@ async def reconcile_suggest_property(
     include_in_schema=False,
 )
 async def reconcile_suggest_type(
+    request: Request,
+    response: Response,
     dataset: str = PATH_DATASET,
     prefix: str = QUERY_PREFIX,
     provider: SearchProvider = Depends(get_provider),
-) -> FreebaseTypeSuggestResponse:
+) -> Union[FreebaseTypeSuggestResponse, Response]:
     """Given a search prefix, return all the types (i.e. schema) which match
     the given text. This is used to auto-complete type selection for the
     configuration of reconciliation in OpenRefine."""
     ds = await get_dataset(dataset)
+    index_state = await get_index_state(provider)
+    if (not_modified := check_etag(request, response, index_state)) is not None:
+        return not_modified
     matches: List[FreebaseType] = []
     for schema in await get_matchable_schemata(provider, ds):
+        if len(matches) >= settings.MATCH_PAGE:
+            break
         if match_prefix(prefix, schema.name, schema.label):
             matches.append(FreebaseType.from_schema(schema))
-    result = matches[: settings.MATCH_PAGE]
-    return FreebaseTypeSuggestResponse(prefix=prefix, result=result)
+    return FreebaseTypeSuggestResponse(prefix=prefix, result=matches)
 
 
 @router.get(
@@ -1,4 +1,4 @@
-from typing import List, Optional, Union
+from typing import List, Optional
 from fastapi import APIRouter, Depends, Path, Query, Response, HTTPException
 from fastapi.responses import RedirectResponse
 from followthemoney import model
@@ -6,6 +6,7 @@ import enum
 
 from yente import settings
 from yente.logs import get_logger
+from yente.cache import cache_key, results_cache
 from yente.data.common import ErrorResponse
 from yente.data.common import EntityResponse, SearchResponse
 from yente.provider import SearchProvider, get_provider
@@ -14,10 +15,11 @@ from yente.search.queries import facet_aggregations
 from yente.search.queries import FilterDict
 from yente.search.search import get_entity, search_entities
 from yente.search.search import result_entities, result_facets, result_total
+from yente.search.status import get_index_state
 from yente.search.nested import serialize_entity
 from yente.data import get_catalog
 from yente.util import limit_window, EntityRedirect
-from yente.routers.util import get_dataset
+from yente.routers.util import get_dataset, json_response
 from yente.routers.util import PATH_DATASET, TS_PATTERN
 
 log = get_logger(__name__)
@@ -88,7 +90,7 @@ async def search(
         title="Facet counts to include in response.",
     ),
     provider: SearchProvider = Depends(get_provider),
-) -> SearchResponse:
+) -> Response:
     """Search endpoint for matching entities based on a simple piece of text, e.g.
     a name. This can be used to implement a simple, user-facing search. For proper
     entity matching, the multi-property matching API should be used instead.
@@ -102,6 +104,33 @@ async def search(
     schema_obj = model.get(schema)
     if schema_obj is None:
         raise HTTPException(400, detail="Invalid schema")
+    # The filters become `terms` clauses, so their order doesn't change the
+    # results and shouldn't split the cache:
+    facet_names = [f.value for f in facets]
+    key = cache_key(
+        "search",
+        await get_index_state(provider),
+        ds.name,
+        q,
+        schema_obj.name,
+        sorted(set(include_dataset + datasets)),
+        sorted(set(exclude_dataset)),
+        sorted(set(exclude_schema)),
+        changed_since,
+        sorted(set(countries)),
+        sorted(set(topics)),
+        limit,
+        offset,
+        sort,
+        target,
+        fuzzy,
+        simple,
+        facet_names,
+    )
+    cached: Optional[SearchResponse] = results_cache.get(key)
+    if cached is not None:
+        response.headers.update(settings.CACHE_HEADERS)
+        return json_response(response, cached)
     filters: FilterDict = {
         "countries": countries,
         "topics": topics,
@@ -121,7 +150,7 @@ async def search(
         exclude_dataset=exclude_dataset,
         changed_since=changed_since,
     )
-    aggregations = facet_aggregations([f.value for f in facets])
+    aggregations = facet_aggregations(facet_names)
     resp = await search_entities(
         provider,
         query,
@@ -147,8 +176,9 @@ async def search(
         dataset=ds.name,
         results=output.total.value,
     )
+    results_cache.set(key, output)
     response.headers.update(settings.CACHE_HEADERS)
-    return output
+    return json_response(response, output)
 
 
 @router.get(
@@ -171,7 +201,7 @@ async def fetch_entity(
         title="Include adjacent entities (e.g. addresses, family) in response",
     ),
     provider: SearchProvider = Depends(get_provider),
-) -> Union[RedirectResponse, EntityResponse]:
+) -> Response:
     """Retrieve a single entity by its ID. The entity will be returned in
     full, with data from all datasets and with nested entities (adjacent
     passport, sanction and associated entities) included. If the entity ID
@@ -190,4 +220,4 @@ async def fetch_entity(
     data = await serialize_entity(provider, entity, nested=nested)
     log.info(data.caption, action="entity", entity_id=entity_id)
     response.headers.update(settings.CACHE_HEADERS)
-    return data
+    return json_response(response, data)
@@ -1,9 +1,11 @@
-from typing import Type
+from typing import Any, Optional, Type
 from fastapi import Path, Query
-from fastapi import HTTPException
+from fastapi import HTTPException, Request, Response
+from pydantic_core import to_json
 from nomenklatura.matching import ALGORITHMS, ScoringAlgorithm, get_algorithm
 
 from yente import settings
+from yente.cache import cache_key
 from yente.data import get_catalog
 from yente.data.dataset import Dataset
 
@@ -37,3 +39,28 @@ async def get_dataset(name: str) -> Dataset:
     if dataset is None:
         raise HTTPException(404, detail="No such dataset.")
     return dataset
+
+
+def check_etag(request: Request, response: Response, *parts: Any) -> Optional[Response]:
+    """Tag the response with an ETag derived from the given parts. If the client
+    already holds the current version, return an empty 304 response to send
+    instead of doing the work."""
+    etag = f'"{cache_key(settings.VERSION, str(request.url), *parts)}"'
+    if etag in request.headers.get("if-none-match", ""):
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    return None
+
+
+def json_response(response: Response, data: Any) -> Response:
+    """Serialise a response model (or a container of them) to JSON in one pass.
+    Returning a response object skips FastAPI's re-validation of the
+    `response_model`, which for a page of entities costs more than the
+    serialisation. FastAPI then also ignores the headers set on the injected
+    `response`, so they are copied over."""
+    headers = {k: v for k, v in response.headers.items() if k != "content-length"}
+    return Response(
+        content=to_json(data, by_alias=True, inf_nan_mode="null"),
+        media_type="application/json",
+        headers=headers,
+    )
@@ -1,10 +1,45 @@
-from typing import Iterable, List, Optional, Type, Dict, Tuple
-from nomenklatura.matching.types import ScoringAlgorithm
+import os
+import asyncio
+import multiprocessing
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Iterable, List, Optional, Type, Dict, Tuple
+from followthemoney import model
+from nomenklatura.matching import ALGORITHMS, get_algorithm
+from nomenklatura.matching.types import FeatureDocs, ScoringAlgorithm
 
 from yente import settings
+from yente.logs import get_logger
 from yente.data.entity import Entity
 from yente.data.common import ScoredEntityResponse
 
+log = get_logger(__name__)
+Scored = Tuple[int, List[ScoredEntityResponse]]
+
+_pool: Optional[ProcessPoolExecutor] = None
+_explanations: Dict[str, FeatureDocs] = {}
+_WARM_UP_ENTITIES = [
+    {
+        "id": "warm-up-person",
+        "schema": "Person",
+        "properties": {
+            "name": ["John Doe"],
+            "birthDate": ["1970-01-01"],
+            "nationality": ["us"],
+        },
+    },
+    {
+        "id": "warm-up-company",
+        "schema": "Company",
+        "properties": {
+            "name": ["ACME Holdings LLC"],
+            "jurisdiction": ["us"],
+            "registrationNumber": ["12345"],
+        },
+    },
+]
+
 
 def score_results(
     algorithm: Type[ScoringAlgorithm],
@@ -14,14 +49,15 @@ def score_results(
     cutoff: float = 0.0,
     limit: Optional[int] = None,
     weights: Dict[str, float] = {},
-) -> Tuple[int, List[ScoredEntityResponse]]:
+) -> Scored:
     scored: List[ScoredEntityResponse] = []
     matches = 0
     for proxy in results:
         scoring = algorithm.compare(entity, proxy, override_weights=weights)
-        result = ScoredEntityResponse.from_entity_result(proxy, scoring, threshold)
-        if result.score <= cutoff:
+        # Don't bother serialising candidates which will be dropped anyway:
+        if scoring.score <= cutoff:
             continue
+        result = ScoredEntityResponse.from_entity_result(proxy, scoring, threshold)
         if result.match:
             matches += 1
         scored.append(result)
@@ -30,3 +66,126 @@ def score_results(
     if limit is not None:
         scored = scored[:limit]
     return matches, scored
+
+
+def explain_algorithm(algorithm: Type[ScoringAlgorithm]) -> FeatureDocs:
+    """Get the feature documentation of an algorithm. Some algorithms re-generate
+    this on every call, while it never changes during the life of the process."""
+    if algorithm.NAME not in _explanations:
+        _explanations[algorithm.NAME] = algorithm.explain()
+    return _explanations[algorithm.NAME]
+
+
+def preload_algorithms() -> None:
+    """Load the model files of all algorithms when a process starts, and run each
+    of them once so that the lazily loaded name data is in place before the
+    first request comes in."""
+    entities = [Entity.from_dict(model, e) for e in _WARM_UP_ENTITIES]
+    for algorithm in ALGORITHMS:
+        explain_algorithm(algorithm)
+        for entity in entities:
+            algorithm.compare(entity, entity)
+
+
+def _score_data(
+    algorithm_name: str,
+    entity_data: Dict[str, Any],
+    results_data: List[Dict[str, Any]],
+    threshold: float,
+    cutoff: float,
+    limit: Optional[int],
+    weights: Dict[str, float],
+) -> Scored:
+    # Entities are sent across the process boundary as plain dicts: pickling
+    # an entity proxy also pickles the whole FtM model.
+    algorithm = get_algorithm(algorithm_name)
+    if algorithm is None:
+        raise RuntimeError("Invalid algorithm: %s" % algorithm_name)
+    entity = Entity.from_dict(model, entity_data)
+    results = (Entity.from_dict(model, r) for r in results_data)
+    return score_results(
+        algorithm,
+        entity,
+        results,
+        threshold=threshold,
+        cutoff=cutoff,
+        limit=limit,
+        weights=weights,
+    )
+
+
+def get_score_pool() -> Optional[ProcessPoolExecutor]:
+    """Get the process pool used to score match candidates, if it is enabled."""
+    global _pool
+    if settings.SCORE_WORKERS < 1:
+        return None
+    if _pool is None:
+        _pool = ProcessPoolExecutor(
+            max_workers=settings.SCORE_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=preload_algorithms,
+        )
+    return _pool
+
+
+def start_score_pool() -> None:
+    """Start the scoring workers when the server starts, rather than on the first
+    request, as spawning them and preloading the algorithms takes a while."""
+    pool = get_score_pool()
+    if pool is None:
+        return
+    # Workers are spawned as work is submitted, one per task while none is idle:
+    for _ in range(settings.SCORE_WORKERS):
+        pool.submit(os.getpid)
+
+
+def close_score_pool() -> None:
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+async def score_results_pooled(
+    algorithm: Type[ScoringAlgorithm],
+    entity: Entity,
+    results: Iterable[Entity],
+    threshold: float = settings.SCORE_THRESHOLD,
+    cutoff: float = 0.0,
+    limit: Optional[int] = None,
+    weights: Dict[str, float] = {},
+) -> Scored:
+    """Score the results in the scoring process pool, so that the event loop is
+    free to handle other requests in the meantime. Falls back to scoring in the
+    current process if no pool is configured."""
+    pool = get_score_pool()
+    if pool is None:
+        return score_results(
+            algorithm,
+            entity,
+            results,
+            threshold=threshold,
+            cutoff=cutoff,
+            limit=limit,
+            weights=weights,
+        )
+    func = partial(
+        _score_data,
+        algorithm.NAME,
+        entity.to_dict(),
+        [r.to_dict() for r in results],
+        threshold,
+        cutoff,
+        limit,
+        weights,
+    )
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(pool, func)
+    except BrokenProcessPool:
+        # Once a worker has died (e.g. killed for running out of memory), the pool
+        # refuses all work, so it is replaced for the requests that follow:
+        log.error("Scoring worker process died, restarting the pool")
+        if _pool is pool:
+            close_score_pool()
+        raise
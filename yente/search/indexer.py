@@ -6,6 +6,7 @@ from followthemoney.exc import FollowTheMoneyException
 from followthemoney.types.date import DateType
 
 from yente import settings
+from yente.cache import results_cache
 from yente.data.manifest import Catalog
 from yente.exc import YenteIndexError
 from yente.logs import get_logger
@@ -22,6 +23,7 @@ from yente.search.mapping import (
 from yente.provider import SearchProvider, with_provider
 from yente.search.versions import parse_index_name
 from yente.search.versions import construct_index_name
+from yente.search.status import clear_index_state
 from yente.data.util import expand_dates, phonetic_names
 from yente.data.util import index_name_parts, index_name_keys
 
@@ -199,6 +201,9 @@ async def update_index(force: bool = False) -> None:
                 await index_entities(provider, dataset, force=force)
 
         await delete_old_indices(provider, catalog)
+        # Cached /match results may refer to data that has just been replaced:
+        results_cache.clear()
+        clear_index_state()
         log.info("Index update complete.")
 
 
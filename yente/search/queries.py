@@ -1,4 +1,5 @@
 from pprint import pprint  # noqa
+from functools import cache
 from typing import Any, Dict, Generator, List, Tuple, Union, Optional
 from followthemoney.schema import Schema
 from followthemoney.proxy import EntityProxy
@@ -16,6 +17,17 @@ FilterDict = Dict[str, Union[bool, str, List[str]]]
 Clause = Dict[str, Any]
 
 
+@cache
+def schema_filter_names(schema: Schema) -> Tuple[str, ...]:
+    """Names of the schemata that results for a query of the given schema may
+    have. This is the same for every request, so it is only worked out once (and
+    is a tuple, as the one value is shared by all queries)."""
+    schemata = set(schema.matchable_schemata)
+    if not schema.matchable:
+        schemata.update(schema.descendants)
+    return tuple(s.name for s in schemata)
+
+
 def filter_query(
     shoulds: List[Clause],
     dataset: Optional[Dataset] = None,
@@ -42,11 +54,7 @@ def filter_query(
     else:
         filterqs.append({"match_none": {}})
     if schema is not None:
-        schemata = schema.matchable_schemata
-        if not schema.matchable:
-            schemata.update(schema.descendants)
-        names = [s.name for s in schemata]
-        filterqs.append({"terms": {"schema": names}})
+        filterqs.append({"terms": {"schema": schema_filter_names(schema)}})
     for field, values in filters.items():
         if isinstance(values, (bool, str)):
             filterqs.append({"term": {field: {"value": values}}})
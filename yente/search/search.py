@@ -7,10 +7,12 @@ from nomenklatura.dataset import DataCatalog
 
 from yente import settings
 from yente.logs import get_logger
+from yente.cache import cache_key, results_cache, single_flight
 from yente.data.dataset import Dataset
 from yente.data.entity import Entity
 from yente.data.common import SearchFacet, SearchFacetItem, TotalSpec
 from yente.provider import SearchProvider
+from yente.search.status import get_index_state
 from yente.util import EntityRedirect
 
 log = get_logger(__name__)
@@ -85,13 +87,32 @@ async def search_entities(
     aggregations: Optional[Dict[str, Any]] = None,
     sort: List[Any] = [],
 ) -> Dict[str, Any]:
-    return await provider.search(
+    # Identical queries that arrive at the same time are sent to the index once:
+    key = cache_key("search", query, limit, offset, aggregations, sort)
+    return await single_flight(
+        key,
+        lambda: provider.search(
+            index=settings.ENTITY_INDEX,
+            query=query,
+            size=limit,
+            sort=sort,
+            from_=offset,
+            aggregations=aggregations,
+            rank_precise=True,
+        ),
+    )
+
+
+async def msearch_entities(
+    provider: SearchProvider,
+    queries: List[Dict[str, Any]],
+    limit: int = 5,
+) -> List[Dict[str, Any]]:
+    """Run a batch of entity queries in one round-trip to the index."""
+    return await provider.msearch(
         index=settings.ENTITY_INDEX,
-        query=query,
+        queries=queries,
         size=limit,
-        sort=sort,
-        from_=offset,
-        aggregations=aggregations,
         rank_precise=True,
     )
 
@@ -106,10 +127,9 @@ async def get_entity(provider: SearchProvider, entity_id: str) -> Optional[Entit
             "minimum_should_match": 1,
         }
     }
-    response = await provider.search(
-        index=settings.ENTITY_INDEX,
-        query=query,
-        size=2,
+    response = await single_flight(
+        cache_key("entity", entity_id),
+        lambda: provider.search(index=settings.ENTITY_INDEX, query=query, size=2),
     )
     hits = response.get("hits", {})
     for hit in hits.get("hits", []):
@@ -126,6 +146,12 @@ async def get_matchable_schemata(
 ) -> Set[Schema]:
     """Get the set of schema used in this dataset that are matchable or
     a parent schema to a matchable schema."""
+    # This is used by the type and property suggest endpoints, which are queried
+    # on every keystroke, so the aggregation result is cached:
+    key = cache_key("matchable_schemata", await get_index_state(provider), dataset.name)
+    cached: Optional[Set[Schema]] = results_cache.get(key)
+    if cached is not None:
+        return set(cached)
     filter_ = {"terms": {"datasets": dataset.dataset_names}}
     facet = "schemata"
     response = await provider.search(
@@ -140,4 +166,5 @@ async def get_matchable_schemata(
         schema = model.get(bucket["key"])
         if schema is not None and schema.matchable:
             schemata.update(schema.schemata)
-    return schemata
+    results_cache.set(key, schemata)
+    return set(schemata)
@@ -1,4 +1,7 @@
+from functools import partial
+
 from yente import settings
+from yente.cache import ResultCache, cache_key, single_flight
 from yente.logs import get_logger
 from yente.provider import SearchProvider
 from yente.search.versions import parse_index_name
@@ -6,6 +9,10 @@ from yente.data.manifest import Catalog
 
 log = get_logger(__name__)
 
+# How long (in seconds) to use a lookup of the indices behind the entity alias:
+INDEX_STATE_TTL = 5
+_index_state: ResultCache[str] = ResultCache(1, INDEX_STATE_TTL)
+
 
 async def sync_dataset_versions(provider: SearchProvider, catalog: Catalog) -> None:
     for aliased_index in await provider.get_alias_indices(settings.ENTITY_INDEX):
@@ -25,3 +32,25 @@ async def sync_dataset_versions(provider: SearchProvider, catalog: Catalog) -> N
                 available=dataset.version,
             )
         dataset.index_version = version
+
+
+async def get_index_state(provider: SearchProvider) -> str:
+    """Return a fingerprint of the indices currently served under the entity alias.
+    It changes whenever a dataset has been re-indexed, including by a separate
+    `yente reindex` process, so it is used to key cached results and ETags. The
+    catalog's dataset versions can't be used for that, as they are updated before
+    the index is."""
+    cached = _index_state.get(settings.ENTITY_INDEX)
+    if cached is not None:
+        return cached
+    indices = await single_flight(
+        cache_key("alias_indices", settings.ENTITY_INDEX),
+        partial(provider.get_alias_indices, settings.ENTITY_INDEX),
+    )
+    state = cache_key(sorted(indices))
+    _index_state.set(settings.ENTITY_INDEX, state)
+    return state
+
+
+def clear_index_state() -> None:
+    _index_state.clear()
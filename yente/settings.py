@@ -179,6 +179,20 @@ MATCH_FUZZY = as_bool(env_str("YENTE_MATCH_FUZZY", "true"))
 # How many match and search queries to run against ES in parallel:
 QUERY_CONCURRENCY = int(env_str("YENTE_QUERY_CONCURRENCY", "50"))
 
+# How many worker processes to use for scoring /match and /reconcile candidates.
+# With the default of 0, scoring is done inside the API process:
+SCORE_WORKERS = int(env_str("YENTE_SCORE_WORKERS", "0"))
+
+# How long (in seconds) to keep the results of identical search, match and
+# reconciliation requests in memory, and how many of them. Set the TTL to 0 to
+# disable the cache:
+RESULTS_CACHE_TTL = int(env_str("YENTE_RESULTS_CACHE_TTL", "60"))
+RESULTS_CACHE_SIZE = int(env_str("YENTE_RESULTS_CACHE_SIZE", "1024"))
+
+# gzip level for compressing responses. Higher levels cost a lot more CPU for
+# barely smaller JSON bodies:
+GZIP_LEVEL = int(env_str("YENTE_GZIP_LEVEL", "6"))
+
 # Default scoring threshold for /match results:
 SCORE_THRESHOLD = 0.70
 